@@ -0,0 +1,63 @@
+"""
+Block color table shared by the renderer and extract_block_properties.py
+
+Resolves the per-block properties from block_properties.json into the
+arrays saved to block_properties.npz.
+"""
+import numpy as np
+
+
+def hex_to_rgb(hex_color):
+    """Convert hex color string to RGB tuple"""
+    if not hex_color or not hex_color.startswith('#'):
+        return None
+    hex_color = hex_color.lstrip('#')
+    if len(hex_color) == 3:
+        hex_color = ''.join([c*2 for c in hex_color])
+    return tuple(int(hex_color[i:i+2], 16) for i in (0, 2, 4))
+
+
+def build_block_lut(properties):
+    """
+    Resolve block properties into a compact color table
+
+    Row i describes names[i]: its base color (TintUp, or ParticleColor when
+    there is no tint), biome tint percent and particle color. has_base is
+    False for entries whose colors could not be resolved.
+
+    Returns: dict of NumPy arrays, as saved to block_properties.npz
+    """
+    count = len(properties)
+    lut = {
+        "names": np.array(list(properties), dtype=str),
+        "base_rgb": np.zeros((count, 3), dtype=np.uint8),
+        "has_base": np.zeros(count, dtype=bool),
+        "biome_tint": np.zeros(count, dtype=np.float64),
+        "particle_rgb": np.zeros((count, 3), dtype=np.uint8),
+        "has_particle": np.zeros(count, dtype=bool),
+    }
+
+    for i, block_props in enumerate(properties.values()):
+        base_color = None
+        particle_color = None
+
+        if block_props.get("TintUp"):
+            base_color = hex_to_rgb(block_props["TintUp"][0])
+            lut["biome_tint"][i] = block_props.get("BiomeTintUp", 0)
+
+        if block_props.get("ParticleColor"):
+            particle_color = hex_to_rgb(block_props["ParticleColor"])
+
+        # If no TintUp, use ParticleColor as base
+        if not base_color and particle_color:
+            base_color = particle_color
+            particle_color = None
+
+        if base_color:
+            lut["base_rgb"][i] = base_color
+            lut["has_base"][i] = True
+        if particle_color:
+            lut["particle_rgb"][i] = particle_color
+            lut["has_particle"][i] = True
+
+    return lut
@@ -1,10 +1,58 @@
 #!/usr/bin/env python3
 """
 Extract block rendering properties from Hytale assets
-Creates a simplified JSON file with just TintUp, BiomeTintUp, and ParticleColor
+Creates a simplified JSON file with just TintUp, BiomeTintUp, and ParticleColor,
+plus the resolved color table the renderer loads (block_properties.npz)
 """
 import json
+import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+import numpy as np
+import orjson
+from block_lut import build_block_lut
+
+
+def read_block_properties(json_file):
+    """
+    Read the rendering properties of a single item file
+
+    Returns: (block_name, properties), or None if the item has no BlockType
+    """
+    try:
+        with open(json_file, 'rb') as f:
+            raw = f.read()
+
+        # Most items aren't blocks; skip them without running the JSON parser
+        if b'"BlockType"' not in raw:
+            return None
+
+        data = orjson.loads(raw)
+
+        # Check if this item has BlockType data
+        if "BlockType" not in data:
+            return None
+
+        block_type = data["BlockType"]
+
+        # Extract the block name from the filename
+        block_name = json_file.stem
+
+        # Extract the properties we need for map rendering
+        # Check for both "Tint" and "TintUp" (Tint is more common)
+        tint = block_type.get("Tint") or block_type.get("TintUp") or []
+
+        properties = {
+            "TintUp": tint,
+            "BiomeTintUp": block_type.get("BiomeTintUp", 100 if tint else 0),  # Default to 100% if tinted
+            "ParticleColor": block_type.get("ParticleColor", None)
+        }
+
+        return block_name, properties
+
+    except (json.JSONDecodeError, KeyError) as e:
+        # Skip files that aren't valid JSON or don't have expected structure
+        return None
 
 
 def extract_block_properties(assets_path):
@@ -14,37 +62,16 @@ def extract_block_properties(assets_path):
 
     block_properties = {}
 
-    # Walk through all JSON files in Items directory
-    for json_file in items_path.rglob("*.json"):
-        try:
-            with open(json_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-
-            # Check if this item has BlockType data
-            if "BlockType" not in data:
+    # Read all JSON files in Items directory on a thread pool so the file reads overlap;
+    # parsing holds the GIL, but most files are skipped before reaching the parser
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+        for result in executor.map(read_block_properties, items_path.rglob("*.json")):
+            if result is None:
                 continue
 
-            block_type = data["BlockType"]
-
-            # Extract the block name from the filename
-            block_name = json_file.stem
-
-            # Extract the properties we need for map rendering
-            # Check for both "Tint" and "TintUp" (Tint is more common)
-            tint = block_type.get("Tint") or block_type.get("TintUp") or []
-
-            properties = {
-                "TintUp": tint,
-                "BiomeTintUp": block_type.get("BiomeTintUp", 100 if tint else 0),  # Default to 100% if tinted
-                "ParticleColor": block_type.get("ParticleColor", None)
-            }
-
+            block_name, properties = result
             block_properties[block_name] = properties
 
-        except (json.JSONDecodeError, KeyError) as e:
-            # Skip files that aren't valid JSON or don't have expected structure
-            continue
-
     return block_properties
 
 
@@ -67,6 +94,12 @@ def main():
 
     print(f"Saved block properties to {output_file}")
 
+    # Save the resolved color table the renderer loads instead of the JSON
+    lut_file = "block_properties.npz"
+    np.savez(lut_file, **build_block_lut(block_properties))
+
+    print(f"Saved block color table to {lut_file}")
+
     # Print some examples
     print("\nExample blocks:")
     for i, (name, props) in enumerate(list(block_properties.items())[:5]):
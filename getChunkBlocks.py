@@ -1,28 +1,28 @@
 import base64
 import struct
 import logging
-import compression.zstd as zstd
-import io
 import bson
+from region_format import Region, HEADER_LENGTH
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.DEBUG)
 
-HEADER_LEN = 32
-REGION_WIDTH_CHUNKS = 32
 
+# Precompiled block data layouts (see decode_blocks)
+BLOCKS_HEADER = struct.Struct(">Ibhb")
+PALETTE_NAME_LENGTH = struct.Struct(">h")
+PALETTE_ENTRY_TAIL = struct.Struct(">hb")
 
-def read_header(file):
+
+def read_header(region):
     logger.debug("===READING HEADER===")
-    header = file.read(HEADER_LEN)
-    magic, version, blob_count, segment_size = struct.unpack(">20sIII", header)
-    logger.debug("Magic: %s", magic.decode("utf-8"))
-    logger.debug("Version: %d", version)
-    logger.debug("Blob Count: %d", blob_count)
-    logger.debug("Segment Size: %d", segment_size)
+    logger.debug("Magic: %s", region.magic)
+    logger.debug("Version: %d", region.version)
+    logger.debug("Blob Count: %d", region.blob_count)
+    logger.debug("Segment Size: %d", region.segment_size)
 
-    return (magic.decode("utf-8"), version, blob_count, segment_size)
+    return (region.magic, region.version, region.blob_count, region.segment_size)
 
 def decode_blocks(blocks):
     '''
@@ -51,59 +51,57 @@ def decode_blocks(blocks):
     there is a lot of... something else at the end. Maybe lighting data? maybe just extra space to prevent realloc?
     not sure yet.
     '''
-    with io.BytesIO(blocks) as b:
-        unknown1, packing_factor, palette_length, unknown2 = struct.unpack(">Ibhb", b.read(8))
-        logger.debug("Unknown 1: %s", hex(unknown1))
-        logger.debug("Packing factor?: %s", hex(packing_factor))
-        logger.debug("Palette Length: %d", palette_length)
-        logger.debug("Unknown 2: %s\n", hex(unknown2))
-        logger.debug("READING PALETTE")
+    unknown1, packing_factor, palette_length, unknown2 = BLOCKS_HEADER.unpack_from(blocks, 0)
+    offset = BLOCKS_HEADER.size
+    logger.debug("Unknown 1: %s", hex(unknown1))
+    logger.debug("Packing factor?: %s", hex(packing_factor))
+    logger.debug("Palette Length: %d", palette_length)
+    logger.debug("Unknown 2: %s\n", hex(unknown2))
+    logger.debug("READING PALETTE")
 
-        palette = []
+    palette = []
 
-        for i in range(palette_length):
-            name_length = struct.unpack(">h", b.read(2))[0]
-            name = b.read(name_length).decode("utf-8")
-            quantity, unknown3 = struct.unpack(">hb", b.read(3))
-            logger.debug("  %d -> %s", i, name)
-            logger.debug("    quantity?: %d", quantity)
-            logger.debug("    unknown3: %s", hex(unknown3))
+    for i in range(palette_length):
+        name_length = PALETTE_NAME_LENGTH.unpack_from(blocks, offset)[0]
+        offset += PALETTE_NAME_LENGTH.size
+        name = blocks[offset:offset + name_length].decode("utf-8")
+        offset += name_length
+        quantity, unknown3 = PALETTE_ENTRY_TAIL.unpack_from(blocks, offset)
+        offset += PALETTE_ENTRY_TAIL.size
+        logger.debug("  %d -> %s", i, name)
+        logger.debug("    quantity?: %d", quantity)
+        logger.debug("    unknown3: %s", hex(unknown3))
 
-            palette.append(name)
+        palette.append(name)
 
-        logger.debug("Palette: \n %s", palette)
+    logger.debug("Palette: \n %s", palette)
 
 
 
     
 
-def read_chunk(file, x, z, segment_size):
+def read_chunk(region, x, z, dump_blocks=False):
     """
-    Reads a chunk in the file (x,z)
+    Reads a chunk in the region (x,z)
 
-    :param file: file handle
+    :param region: memory-mapped Region
     :param x: chunk x coordinate relative to region
     :param z: chunk z coordinate relative to region
-    :param segment_size: segment size in region file (so far always 4096)
+    :param dump_blocks: write the raw block data to chunk-{x}-{z}-{SECTION}.blocks
     """
     logger.debug("===READING CHUNK %d,%d===", x, z)
-    # offset into the chunk location table at beginning of file
-    index_offset = (x + z * REGION_WIDTH_CHUNKS) * 4
-    file.seek(HEADER_LEN + index_offset)
     # 1. Get segment number in region file
-    segment = struct.unpack(">I", file.read(4))[0]
-    location = segment * segment_size + HEADER_LEN
+    segment = region.chunk_segment(x, z)
+    location = segment * region.segment_size + HEADER_LENGTH
     logger.debug("(X,Z)=>(%d,%d) Segment: %d, Offset: %d", 0, 0, segment, location)
 
     # 2. Read Chunk Sizes (decompressed, then compressed sizes)
-    file.seek(location)
-    uncompressed_size, compressed_size = struct.unpack(">II", file.read(8))
+    uncompressed_size, compressed_size = region.chunk_sizes(x, z)
     logger.debug("Uncompressed Chunk Size (bytes): %d", uncompressed_size)
     logger.debug("Compressed Chunk Size (bytes): %d", compressed_size)
-    compressed_bytes = file.read(compressed_size)
 
-    # 3. decompress chunk using zstd
-    decompressed = zstd.decompress(compressed_bytes)
+    # 3. decompress chunk using zstd, straight from the mapped region
+    decompressed = region.read_chunk(x, z)
 
     # 4. Deserialize BSON
     chunk = bson.decode(decompressed)
@@ -122,19 +120,20 @@ def read_chunk(file, x, z, segment_size):
     logger.debug("Block version: %d", block_version)
     logger.debug("Section 0 block len (bytes): %d", len(blocks))
 
-    chunk_filename = f"chunk-{x}-{z}-{SECTION}.blocks"
-    logger.info("Dumping chunk to %s", chunk_filename)
-    with open(chunk_filename, "wb") as f:
-        f.write(blocks)
+    if dump_blocks:
+        chunk_filename = f"chunk-{x}-{z}-{SECTION}.blocks"
+        logger.info("Dumping chunk to %s", chunk_filename)
+        with open(chunk_filename, "wb") as f:
+            f.write(blocks)
     
     decode_blocks(blocks)
 
 
 def main(filePath):
     """"""
-    with open(filePath, "rb") as file:
-        magic, version, blob_count, segment_size = read_header(file)
-        read_chunk(file, 0, 0, segment_size)
+    with Region(filePath) as region:
+        magic, version, blob_count, segment_size = read_header(region)
+        read_chunk(region, 0, 0, dump_blocks=True)
 
 
 if __name__ == "__main__":
@@ -1,13 +1,16 @@
 import sys
 import struct
-import compression.zstd as zstd
 from pathlib import Path
 import bson
 import io
+from region_format import Region
 
 # BASE_PATH = "SRV/universe/worlds/default/chunks"
 BASE_PATH = "C:/Users/Jacob/AppData/Roaming/Hytale/UserData/Saves/2026-01-30/universe/worlds/default_world/chunks"
-HEADER_LENGTH = 32
+
+# HalfByte nibble table: _NIB[(byte << 1) | (flat_idx & 1)] is the low (even
+# index) or high (odd index) nibble of byte
+_NIB = bytes((b >> (4 * (i & 1))) & 0xF for b in range(256) for i in range(2))
 
 def get_block(x, y, z, quiet=False):
     ''''''
@@ -33,21 +36,18 @@ def get_block(x, y, z, quiet=False):
     if not quiet: print(f"Relative Chunk: {relativeChunkX},{relativeChunkZ}")
 
     # 3 open chunk
-    with p.open("rb") as region:
-        header = region.read(HEADER_LENGTH)
-        magic, version, blob_count, segment_size = struct.unpack(">20sIII", header)
-        if not quiet: print(f"M: {magic}, V: {version}, BC: {blob_count}, SS: {segment_size}")
-        index_offset = (relativeChunkX + relativeChunkZ * 32) * 4
-        region.seek(HEADER_LENGTH + index_offset)
-        blob_segment = struct.unpack(">I", region.read(4))[0]
-        chunk_location = blob_segment * segment_size + HEADER_LENGTH
-        region.seek(chunk_location)
+    with Region(p) as region:
+        if not quiet: print(f"M: {region.magic}, V: {region.version}, BC: {region.blob_count}, SS: {region.segment_size}")
 
         # 4 read chunk data
-        uncompressed_size, compressed_size = struct.unpack(">II", region.read(8))
-        if not quiet: print(f"UNCOMPRESSED SIZE: {uncompressed_size}, COMPRESSED_SIZE: {compressed_size}, RATIO: {compressed_size/uncompressed_size}")
-        compressed_bytes = region.read(compressed_size)
-        decompressed = zstd.decompress(compressed_bytes)
+        sizes = region.chunk_sizes(relativeChunkX, relativeChunkZ)
+        if not quiet and sizes:
+            uncompressed_size, compressed_size = sizes
+            print(f"UNCOMPRESSED SIZE: {uncompressed_size}, COMPRESSED_SIZE: {compressed_size}, RATIO: {compressed_size/uncompressed_size}")
+        decompressed = region.read_chunk(relativeChunkX, relativeChunkZ)
+        if decompressed is None:
+            print(f"Chunk {worldChunkX},{worldChunkZ} not present")
+            return None
         chunk_data = bson.decode(decompressed)
 
         # 5 get y segment
@@ -114,15 +114,11 @@ def get_block(x, y, z, quiet=False):
 
         # Get internal ID from blocks array
         if palette_type == 1:  # HalfByte
-            byte_idx = flat_idx // 2
-            if flat_idx % 2 == 0:
-                internal_id = blocks_array[byte_idx] & 0x0F
-            else:
-                internal_id = (blocks_array[byte_idx] >> 4) & 0x0F
+            internal_id = _NIB[(blocks_array[flat_idx >> 1] << 1) | (flat_idx & 1)]
         elif palette_type == 2:  # Byte
             internal_id = blocks_array[flat_idx]
         elif palette_type == 3:  # Short
-            internal_id = struct.unpack('>H', blocks_array[flat_idx*2:flat_idx*2+2])[0]
+            internal_id = int.from_bytes(blocks_array[flat_idx*2:flat_idx*2+2], 'big')
         else:
             internal_id = 0
 
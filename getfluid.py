@@ -1,15 +1,12 @@
 import sys
-import struct
-import compression.zstd as zstd
 from pathlib import Path
 import bson
 import base64
 import json
-import io
+from region_format import Region
 
 # BASE_PATH = "SRV/universe/worlds/default/chunks"
 BASE_PATH = "C:/Users/Jacob/AppData/Roaming/Hytale/UserData/Saves/2026-01-30/universe/worlds/default_world/chunks"
-HEADER_LENGTH = 32
 
 def get_fluid(x, y, z, quiet=False):
     ''''''
@@ -35,21 +32,18 @@ def get_fluid(x, y, z, quiet=False):
     if not quiet: print(f"Relative Chunk: {relativeChunkX},{relativeChunkZ}")
 
     # 3 open chunk
-    with p.open("rb") as region:
-        header = region.read(HEADER_LENGTH)
-        magic, version, blob_count, segment_size = struct.unpack(">20sIII", header)
-        if not quiet: print(f"M: {magic}, V: {version}, BC: {blob_count}, SS: {segment_size}")
-        index_offset = (relativeChunkX + relativeChunkZ * 32) * 4
-        region.seek(HEADER_LENGTH + index_offset)
-        blob_segment = struct.unpack(">I", region.read(4))[0]
-        chunk_location = blob_segment * segment_size + HEADER_LENGTH
-        region.seek(chunk_location)
+    with Region(p) as region:
+        if not quiet: print(f"M: {region.magic}, V: {region.version}, BC: {region.blob_count}, SS: {region.segment_size}")
 
         # 4 read chunk data
-        uncompressed_size, compressed_size = struct.unpack(">II", region.read(8))
-        if not quiet: print(f"UNCOMPRESSED SIZE: {uncompressed_size}, COMPRESSED_SIZE: {compressed_size}, RATIO: {compressed_size/uncompressed_size}")
-        compressed_bytes = region.read(compressed_size)
-        decompressed = zstd.decompress(compressed_bytes)
+        sizes = region.chunk_sizes(relativeChunkX, relativeChunkZ)
+        if not quiet and sizes:
+            uncompressed_size, compressed_size = sizes
+            print(f"UNCOMPRESSED SIZE: {uncompressed_size}, COMPRESSED_SIZE: {compressed_size}, RATIO: {compressed_size/uncompressed_size}")
+        decompressed = region.read_chunk(relativeChunkX, relativeChunkZ)
+        if decompressed is None:
+            print(f"Chunk {worldChunkX},{worldChunkZ} not present")
+            return None
         chunk_data = bson.decode(decompressed)
 
         column = chunk_data["Components"]["ChunkColumn"]
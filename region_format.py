@@ -0,0 +1,89 @@
+"""
+Memory-mapped access to Hytale region files (*.region.bin)
+
+See INDEXED_STORAGE_SPEC.md for the layout.
+"""
+import mmap
+import struct
+from pathlib import Path
+import compression.zstd as zstd
+
+# Precompiled region file layouts (big-endian), shared by the readers
+HEADER = struct.Struct(">20sIII")  # magic, version, blob_count, segment_size
+INDEX = struct.Struct(">I")        # segment number of a chunk (0 if absent)
+SIZES = struct.Struct(">II")       # uncompressed_size, compressed_size of a chunk
+
+HEADER_LENGTH = HEADER.size
+REGION_WIDTH_CHUNKS = 32
+
+
+class Region:
+    """
+    Read-only view of a region file backed by mmap
+
+    Header and index lookups read straight from the mapping, and compressed
+    chunk data is handed to the decompressor without copying it out first.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        with self.path.open("rb") as f:
+            self.mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, self.version, self.blob_count, self.segment_size = HEADER.unpack_from(self.mmap, 0)
+        self.magic = magic.decode("utf-8")
+
+    def chunk_segment(self, x, z):
+        """Get the segment number of chunk (x, z) relative to the region (0 if absent)"""
+        index_offset = (x + z * REGION_WIDTH_CHUNKS) * INDEX.size
+        return INDEX.unpack_from(self.mmap, HEADER_LENGTH + index_offset)[0]
+
+    def chunk_offset(self, x, z):
+        """Get the byte offset of chunk (x, z) relative to the region, or None if absent"""
+        segment = self.chunk_segment(x, z)
+        if segment == 0:
+            return None
+        return segment * self.segment_size + HEADER_LENGTH
+
+    def chunk_sizes(self, x, z):
+        """Get (uncompressed_size, compressed_size) of chunk (x, z), or None if absent"""
+        location = self.chunk_offset(x, z)
+        if location is None:
+            return None
+        return SIZES.unpack_from(self.mmap, location)
+
+    def read_chunk(self, x, z):
+        """
+        Read and decompress chunk (x, z) relative to the region
+
+        Returns: decompressed BSON bytes, or None if the chunk is not present
+        """
+        location = self.chunk_offset(x, z)
+        if location is None:
+            return None
+
+        uncompressed_size, compressed_size = SIZES.unpack_from(self.mmap, location)
+        start = location + SIZES.size
+
+        # Decompress straight from the mapping, with no intermediate copy of the
+        # compressed bytes. max_length only caps the output, so a frame that is
+        # cut short or longer than declared is rejected rather than truncated
+        decompressor = zstd.ZstdDecompressor()
+        with memoryview(self.mmap)[start:start + compressed_size] as compressed:
+            data = decompressor.decompress(compressed, max_length=uncompressed_size)
+
+        if not decompressor.eof or len(data) != uncompressed_size:
+            raise ValueError(
+                f"Chunk ({x}, {z}) in {self.path.name}: decompressed size does not match "
+                f"the declared {uncompressed_size} bytes"
+            )
+        return data
+
+    def close(self):
+        self.mmap.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -5,20 +5,52 @@ Simple chunk renderer - generates a top-down map image of a single chunk
 import sys
 import struct
 import math
-import io
+import functools
 import json
+from dataclasses import dataclass
 from pathlib import Path
 sys.path.insert(0, "..")
-import compression.zstd as zstd
 import bson
+from bson.raw_bson import RawBSONDocument
+import numpy as np
 from PIL import Image
+from region_format import Region
+from block_lut import build_block_lut
+
+try:
+    from numba import njit
+except ImportError:  # Numba is optional; the NumPy scan is used without it
+    njit = None
 
 # BASE_PATH = "SRV/universe/worlds/default/chunks"
 BASE_PATH = "C:/Users/Jacob/AppData/Roaming/Hytale/UserData/Saves/2026-01-30/universe/worlds/default_world/chunks"
-HEADER_LENGTH = 32
 
-# Cache for block properties
+# Chunk components used for rendering
+RENDERED_COMPONENTS = ("ChunkColumn", "BlockChunk")
+
+# Precompiled block section layouts (big-endian)
+_SECTION_HEADER = struct.Struct('>IBH')       # migration_count, palette_type, palette_size
+_PALETTE_ENTRY_BYTE = struct.Struct('>BH')    # internal_id, name_length
+_PALETTE_ENTRY_SHORT = struct.Struct('>HH')   # internal_id, name_length (Short palettes)
+_PALETTE_COUNT = struct.Struct('>H')          # block count following the name
+_FLUID_HEADER = struct.Struct('>BH')          # palette_type, palette_size (no migration_count)
+
+# Precompiled BlockChunk layouts (little-endian)
+_U8 = struct.Struct('<B')
+_U16_LE = struct.Struct('<H')
+_U32_LE = struct.Struct('<I')
+
+# Cache for block properties and the color table derived from them
 _block_properties = None
+_block_lut = None
+
+# Resolved colors of the block names seen so far (see block_color_ids)
+_color_ids = {}
+_color_rows = []
+_color_table = None
+
+# Cache of open regions, keyed by region file path
+_regions = {}
 
 
 def load_block_properties():
@@ -31,267 +63,351 @@ def load_block_properties():
     return _block_properties
 
 
-def hex_to_rgb(hex_color):
-    """Convert hex color string to RGB tuple"""
-    if not hex_color or not hex_color.startswith('#'):
-        return None
-    hex_color = hex_color.lstrip('#')
-    if len(hex_color) == 3:
-        hex_color = ''.join([c*2 for c in hex_color])
-    return tuple(int(hex_color[i:i+2], 16) for i in (0, 2, 4))
+def load_block_lut():
+    """
+    Load the block color table (cached)
+
+    Reads block_properties.npz when it is at least as new as
+    block_properties.json, otherwise builds the table from the JSON.
+    """
+    global _block_lut
+    if _block_lut is None:
+        properties_path = Path(__file__).parent / "block_properties.json"
+        lut_path = properties_path.with_suffix(".npz")
+        if lut_path.exists() and lut_path.stat().st_mtime >= properties_path.stat().st_mtime:
+            with np.load(lut_path) as data:
+                _block_lut = dict(data)
+        else:
+            _block_lut = build_block_lut(load_block_properties())
+
+        # Block name -> row in the table
+        names = _block_lut["names"].tolist()
+        _block_lut["ids"] = {name: i for i, name in enumerate(names)}
+
+        # Prepared (base_color, biome_tint_percent, particle_color) per row (None without
+        # a base color), and the rows usable for prefix matches in file order
+        _block_lut["colors"] = [
+            (
+                tuple(base),
+                biome_tint,
+                tuple(particle) if has_particle else None,
+            ) if has_base else None
+            for base, has_base, biome_tint, particle, has_particle in zip(
+                _block_lut["base_rgb"].tolist(),
+                _block_lut["has_base"].tolist(),
+                _block_lut["biome_tint"].tolist(),
+                _block_lut["particle_rgb"].tolist(),
+                _block_lut["has_particle"].tolist(),
+            )
+        ]
+        _block_lut["prefixes"] = [(name, i) for i, name in enumerate(names) if _block_lut["colors"][i]]
+    return _block_lut
+
+
+def get_region(region_x, region_z, quiet=False):
+    """Open a region file once and reuse its mapping (cached), or None if missing"""
+    region_path = Path(f"{BASE_PATH}/{region_x}.{region_z}.region.bin")
+    region = _regions.get(region_path)
+    if region is None:
+        if not region_path.exists():
+            if not quiet: print(f"Region file not found: {region_path}")
+            return None
+        region = _regions[region_path] = Region(region_path)
+    return region
+
 
-def read_chunk_data(chunk_x, chunk_z):
+def read_chunk_data(chunk_x, chunk_z, quiet=False):
     """Read chunk from region file"""
     # Calculate region
     region_x = (chunk_x * 32) // 1024
     region_z = (chunk_z * 32) // 1024
 
-    region_path = Path(f"{BASE_PATH}/{region_x}.{region_z}.region.bin")
-    if not region_path.exists():
-        print(f"Region file not found: {region_path}")
+    region = get_region(region_x, region_z, quiet)
+    if region is None:
         return None
 
-    with region_path.open("rb") as f:
-        # Read header
-        header = f.read(HEADER_LENGTH)
-        magic, version, blob_count, segment_size = struct.unpack(">20sIII", header)
+    # Get chunk location
+    relative_x = (chunk_x * 32 // 32) % 32
+    relative_z = (chunk_z * 32 // 32) % 32
 
-        # Get chunk location
-        relative_x = (chunk_x * 32 // 32) % 32
-        relative_z = (chunk_z * 32 // 32) % 32
-        index_offset = (relative_x + relative_z * 32) * 4
+    # Read and decompress chunk straight from the mapped region
+    decompressed = region.read_chunk(relative_x, relative_z)
+    if decompressed is None:
+        if not quiet: print(f"Chunk ({chunk_x}, {chunk_z}) not present")
+        return None
 
-        f.seek(HEADER_LENGTH + index_offset)
-        segment = struct.unpack(">I", f.read(4))[0]
+    # Only decode the components the renderer reads; the rest of the chunk
+    # (entities, metadata, ...) is skipped over as raw bytes
+    components = RawBSONDocument(decompressed)["Components"]
+    return {
+        "Components": {
+            name: bson.decode(components[name].raw)
+            for name in RENDERED_COMPONENTS
+            if name in components
+        }
+    }
+
+
+# Byte offset of each of the 1024 packed 10-bit indices
+_TEN_BIT_OFFSETS = (np.arange(1024) * 10) >> 3
+
+# Every 5 bytes (40 bits) hold exactly four 10-bit indices, at these shifts
+_TEN_BIT_LANES = np.array([0, 10, 20, 30], dtype=np.uint64)
+
+
+if njit is not None:
+    @njit(cache=True)
+    def _unpack_10bit_groups(raw):
+        """Split each 5-byte group of a 1280-byte buffer into four 10-bit indices"""
+        values = np.empty(1024, dtype=np.int64)
+        for group in range(256):
+            word = 0
+            for k in range(5):
+                word |= np.int64(raw[group * 5 + k]) << (8 * k)
+            for lane in range(4):
+                values[group * 4 + lane] = (word >> (10 * lane)) & 0x3FF
+        return values
+else:
+    _unpack_10bit_groups = None
+
+
+def unpack_10bit(packed_data):
+    """
+    Unpack 1024 little-endian 10-bit indices (1280 bytes) at once
 
-        if segment == 0:
-            print(f"Chunk ({chunk_x}, {chunk_z}) not present")
-            return None
+    Returns: (values, valid) arrays of length 1024, where valid is False for
+    indices that run past the end of packed_data
+    """
+    raw = np.frombuffer(packed_data, dtype=np.uint8)[:1280]
+    if raw.size < 1280:
+        raw = np.concatenate((raw, np.zeros(1280 - raw.size, dtype=np.uint8)))
 
-        # Read chunk
-        f.seek(segment * segment_size + HEADER_LENGTH)
-        uncompressed_size, compressed_size = struct.unpack(">II", f.read(8))
-        compressed_data = f.read(compressed_size)
+    valid = _TEN_BIT_OFFSETS + 1 < len(packed_data)
+    if _unpack_10bit_groups is not None:
+        return _unpack_10bit_groups(raw), valid
 
-        # Decompress and decode
-        decompressed = zstd.decompress(compressed_data)
-        return bson.decode(decompressed)
+    # Widen each 5-byte group to a little-endian uint64 word and split it
+    # into four indices with constant shifts
+    words = np.zeros((256, 8), dtype=np.uint8)
+    words[:, :5] = raw.reshape(256, 5)
+    values = (words.view('<u8') >> _TEN_BIT_LANES) & 0x3FF
+    return values.ravel(), valid
 
 
 def parse_biome_tints(chunk_data):
     """
     Parse heightmap and biome tint colors from BlockChunk.Data
-    Returns: (heightmap, tint_colors) where heightmap is 32x32 shorts and tint_colors is 32x32 RGB tuples
+    Returns: (heightmap, tint_colors, tint_valid) where heightmap is a 32x32 int32 array,
+    tint_colors is a (32, 32, 3) uint8 RGB array and tint_valid is a 32x32 bool array,
+    all indexed [z, x] (tint_valid is False for columns the packed tint data does not
+    cover, whose tint_colors are zero)
     """
     if 'BlockChunk' not in chunk_data['Components']:
         return None
 
     block_chunk_data = chunk_data['Components']['BlockChunk']['Data']
-    reader = io.BytesIO(block_chunk_data)
 
     # Read needsPhysics (1 byte)
-    needs_physics = struct.unpack('B', reader.read(1))[0]
+    needs_physics = _U8.unpack_from(block_chunk_data, 0)[0]
+    offset = _U8.size
 
     # Parse ShortBytePalette (heightmap) - 10-bit indices
-    height_count = struct.unpack('<H', reader.read(2))[0]
+    height_count = _U16_LE.unpack_from(block_chunk_data, offset)[0]
+    offset += _U16_LE.size
 
-    # Read height palette (short values)
-    height_palette = []
-    for i in range(height_count):
-        height = struct.unpack('<H', reader.read(2))[0]
-        height_palette.append(height)
+    # Read height palette (short values) in one go
+    height_palette = np.frombuffer(block_chunk_data, dtype='<u2', count=height_count, offset=offset)
+    offset += height_palette.nbytes
 
     # Read packed height indices
-    height_packed_len = struct.unpack('<I', reader.read(4))[0]
-    height_packed_data = reader.read(height_packed_len)
-
-    # Unpack 10-bit indices (1024 values, 1280 bytes)
-    heightmap = [[0 for _ in range(32)] for _ in range(32)]
-    for i in range(1024):
-        # Extract 10-bit value from packed data
-        bit_offset = i * 10
-        byte_offset = bit_offset // 8
-        bit_in_byte = bit_offset % 8
-
-        # Read 2 bytes to get the 10-bit value
-        if byte_offset + 1 < len(height_packed_data):
-            byte1 = height_packed_data[byte_offset]
-            byte2 = height_packed_data[byte_offset + 1] if byte_offset + 1 < len(height_packed_data) else 0
-
-            # Extract 10 bits
-            value = ((byte1 >> bit_in_byte) | (byte2 << (8 - bit_in_byte))) & 0x3FF
-
-            # Map to x, z coordinates (Z-major: index = z * 32 + x)
-            x = i % 32
-            z = i // 32
-
-            # Look up height in palette
-            if value < len(height_palette):
-                heightmap[z][x] = height_palette[value]
-            else:
-                heightmap[z][x] = 0  # Fallback
+    height_packed_len = _U32_LE.unpack_from(block_chunk_data, offset)[0]
+    offset += _U32_LE.size
+    height_packed_data = block_chunk_data[offset:offset + height_packed_len]
+    offset += len(height_packed_data)
+
+    # Unpack 10-bit indices (1024 values, 1280 bytes), stored Z-major (index = z * 32 + x)
+    values, valid = unpack_10bit(height_packed_data)
+
+    # Look up heights in the palette; missing or out-of-range indices use the trailing 0
+    lookup = np.append(height_palette.astype(np.int32), 0)
+    values = np.where(valid & (values < len(height_palette)), values, len(height_palette))
+    heightmap = lookup[values].reshape(32, 32)
 
     # Parse IntBytePalette (biome tints)
-    tint_count = struct.unpack('<H', reader.read(2))[0]
+    tint_count = _U16_LE.unpack_from(block_chunk_data, offset)[0]
+    offset += _U16_LE.size
 
-    # Read tint palette (RGB colors)
-    tint_palette = []
-    for i in range(tint_count):
-        rgb_int = struct.unpack('<I', reader.read(4))[0]
-        r = (rgb_int >> 16) & 0xFF
-        g = (rgb_int >> 8) & 0xFF
-        b = rgb_int & 0xFF
-        tint_palette.append((r, g, b))
+    # Read tint palette (RGB colors) in one go; each little-endian 0xAARRGGBB
+    # int is stored as the bytes B, G, R, A
+    tint_bytes = np.frombuffer(block_chunk_data, dtype=np.uint8, count=4 * tint_count, offset=offset)
+    tint_palette = tint_bytes.reshape(tint_count, 4)[:, 2::-1]
+    offset += tint_bytes.nbytes
 
     # Read packed tint indices
-    tint_packed_len = struct.unpack('<I', reader.read(4))[0]
-    tint_packed_data = reader.read(tint_packed_len)
+    tint_packed_len = _U32_LE.unpack_from(block_chunk_data, offset)[0]
+    offset += _U32_LE.size
+    tint_packed_data = block_chunk_data[offset:offset + tint_packed_len]
+
+    # Unpack 10-bit indices (1024 values, 1280 bytes), stored column-major (Z varies fastest)
+    values, valid = unpack_10bit(tint_packed_data)
+
+    # Look up colors in the palette; out-of-range indices use the white fallback
+    # after the palette, and missing indices the zero color after that
+    lookup = np.concatenate((tint_palette, [(255, 255, 255), (0, 0, 0)])).astype(np.uint8)
+    values = np.where(values < len(tint_palette), values, len(tint_palette))
+    values[~valid] = len(tint_palette) + 1
+    tint_colors = lookup[values].reshape(32, 32, 3).transpose(1, 0, 2)
+    tint_valid = valid.reshape(32, 32).T
+
+    return heightmap, tint_colors, tint_valid
+
 
-    # Unpack 10-bit indices (1024 values, 1280 bytes)
-    tint_colors = [[None for _ in range(32)] for _ in range(32)]
-    for i in range(1024):
-        # Extract 10-bit value from packed data
-        bit_offset = i * 10
-        byte_offset = bit_offset // 8
-        bit_in_byte = bit_offset % 8
+def _decode_halfbyte(data_array):
+    """HalfByte - 4 bits per index, low nibble first"""
+    # Split each byte into a (lo, hi) pair of uint16 lanes in place; the
+    # pairs flatten straight into the interleaved order
+    packed = np.frombuffer(data_array, dtype=np.uint8)
+    ids = np.empty((packed.size, 2), dtype=np.uint16)
+    np.bitwise_and(packed, 0x0F, out=ids[:, 0])
+    np.right_shift(packed, 4, out=ids[:, 1])
+    return ids.ravel()
 
-        # Read 2 bytes to get the 10-bit value
-        if byte_offset + 1 < len(tint_packed_data):
-            byte1 = tint_packed_data[byte_offset]
-            byte2 = tint_packed_data[byte_offset + 1] if byte_offset + 1 < len(tint_packed_data) else 0
 
-            # Extract 10 bits
-            value = ((byte1 >> bit_in_byte) | (byte2 << (8 - bit_in_byte))) & 0x3FF
+def _decode_byte(data_array):
+    """Byte - 8 bits per index"""
+    return np.frombuffer(data_array, dtype=np.uint8).astype(np.uint16)
 
-            # Map to x, z coordinates (data stored in column-major order: Z varies fastest)
-            z = i % 32
-            x = i // 32
 
-            # Look up color in palette
-            if value < len(tint_palette):
-                tint_colors[z][x] = tint_palette[value]
-            else:
-                tint_colors[z][x] = (255, 255, 255)  # White fallback
+def _decode_short(data_array):
+    """Short - 16 bits per index (big-endian)"""
+    return np.frombuffer(data_array, dtype='>u2').astype(np.uint16)
 
-    return heightmap, tint_colors
+
+# Tables indexed by palette type (0=Empty, 1=HalfByte, 2=Byte, 3=Short)
+_DECODERS = (None, _decode_halfbyte, _decode_byte, _decode_short)
+_ARRAY_BYTES = (0, 16384, 32768, 65536)  # packed bytes for all 32768 indices
+_PLANE_BYTES = (0, 512, 1024, 2048)      # packed bytes per 32x32 Y layer
+
+
+def decode_ids(data_array, palette_type):
+    """Decode packed palette indices into a flat uint16 array of internal IDs, or None"""
+    if palette_type >= len(_DECODERS) or _DECODERS[palette_type] is None:
+        return None
+    return _DECODERS[palette_type](data_array)
+
+
+def decode_indices(data_array, palette_type):
+    """
+    Decode a packed section array into a (32, 32, 32) uint16 grid of internal IDs
+
+    The grid is indexed [y, z, x], matching the Y-Z-X flat index ordering.
+    """
+    ids = decode_ids(data_array, palette_type)
+    return ids.reshape(32, 32, 32) if ids is not None else None
+
+
+def decode_plane(data_array, palette_type, y):
+    """
+    Decode a single Y layer of a packed section array into a (32, 32) uint16 grid
+    indexed [z, x], touching only that layer's bytes
+    """
+    if palette_type >= len(_PLANE_BYTES) or not _PLANE_BYTES[palette_type]:
+        return None
+    plane_bytes = _PLANE_BYTES[palette_type]
+
+    start = (y & 31) * plane_bytes
+    with memoryview(data_array)[start:start + plane_bytes] as plane:
+        return decode_ids(plane, palette_type).reshape(32, 32)
 
 
 def parse_block_section(section_data):
-    """Parse block section to get palette and blocks array"""
-    reader = io.BytesIO(section_data)
+    """
+    Parse block section to get palette and blocks array
 
+    Returns: (palette, blocks, palette_type) where palette is an object array
+    mapping internal ID -> raw UTF-8 block name (bytes, decoded lazily by callers)
+    and blocks is a (32, 32, 32) uint16 array of internal IDs indexed [y, z, x]
+    (None for empty sections)
+    """
     # Read header
-    migration_count = struct.unpack('>I', reader.read(4))[0]
-    palette_type = struct.unpack('>B', reader.read(1))[0]
-    palette_size = struct.unpack('>H', reader.read(2))[0]
+    migration_count, palette_type, palette_size = _SECTION_HEADER.unpack_from(section_data, 0)
+    offset = _SECTION_HEADER.size
 
     # Read palette
+    entry = _PALETTE_ENTRY_SHORT if palette_type == 3 else _PALETTE_ENTRY_BYTE
     palette = {}
     for i in range(palette_size):
-        if palette_type == 3:  # Short
-            internal_id = struct.unpack('>H', reader.read(2))[0]
-        else:
-            internal_id = struct.unpack('>B', reader.read(1))[0]
-
-        name_length = struct.unpack('>H', reader.read(2))[0]
-        block_name = reader.read(name_length).decode('utf-8')
-        count = struct.unpack('>H', reader.read(2))[0]
+        internal_id, name_length = entry.unpack_from(section_data, offset)
+        offset += entry.size
+        block_name = section_data[offset:offset + name_length]
+        offset += name_length
+        count = _PALETTE_COUNT.unpack_from(section_data, offset)[0]
+        offset += _PALETTE_COUNT.size
         palette[internal_id] = block_name
 
-    # Read blocks array
-    if palette_type == 0:  # Empty
-        return palette, None, palette_type
-    elif palette_type == 1:
-        blocks_array = reader.read(16384)
-    elif palette_type == 2:
-        blocks_array = reader.read(32768)
-    elif palette_type == 3:
-        blocks_array = reader.read(65536)
-    else:
-        return palette, None, palette_type
+    # Read blocks array (none for Empty or unknown palette types)
+    array_bytes = _ARRAY_BYTES[palette_type] if palette_type < len(_ARRAY_BYTES) else 0
+    if not array_bytes:
+        return build_palette_array(palette), None, palette_type
 
-    return palette, blocks_array, palette_type
+    blocks = decode_indices(section_data[offset:offset + array_bytes], palette_type)
+    return build_palette_array(palette, int(blocks.max())), blocks, palette_type
 
 
-def get_block_at(palette, blocks_array, palette_type, x, y, z):
-    """Get block at local coordinates (0-31)"""
-    if blocks_array is None:
-        return "Empty"
+def build_palette_array(palette, max_id=0):
+    """
+    Convert a {internal_id: name} palette into an object array indexable by ID
 
-    # Calculate flat index (Y-Z-X ordering)
-    flat_idx = ((y & 31) << 10) | ((z & 31) << 5) | (x & 31)
+    IDs missing from the palette (up to max_id) map to b"Empty".
+    """
+    size = max(max(palette, default=0), max_id) + 1
+    return np.array([palette.get(i, b"Empty") for i in range(size)], dtype=object)
 
-    # Get internal ID
-    if palette_type == 1:  # HalfByte
-        byte_idx = flat_idx // 2
-        if flat_idx % 2 == 0:
-            internal_id = blocks_array[byte_idx] & 0x0F
-        else:
-            internal_id = (blocks_array[byte_idx] >> 4) & 0x0F
-    elif palette_type == 2:  # Byte
-        internal_id = blocks_array[flat_idx]
-    elif palette_type == 3:  # Short
-        internal_id = struct.unpack('>H', blocks_array[flat_idx*2:flat_idx*2+2])[0]
-    else:
-        return "Empty"
 
-    return palette.get(internal_id, "Empty")
+def is_air(raw_name):
+    """Check whether a raw palette block name is air (Empty or a '*' placeholder)"""
+    return raw_name == b"Empty" or raw_name.startswith(b"*")
 
 
 def parse_fluid_section(fluid_data):
     """Parse fluid section to get type palette, type array, and level array"""
-    reader = io.BytesIO(fluid_data)
-
     # Check if we have enough data for header
-    if len(fluid_data) < 3:
+    if len(fluid_data) < _FLUID_HEADER.size:
         return {}, None, None, 0
 
     # Read header (no migration_count for fluids)
-    palette_type_bytes = reader.read(1)
-    if len(palette_type_bytes) < 1:
-        return {}, None, None, 0
-    palette_type = struct.unpack('>B', palette_type_bytes)[0]
-
-    palette_size_bytes = reader.read(2)
-    if len(palette_size_bytes) < 2:
-        return {}, None, None, 0
-    palette_size = struct.unpack('>H', palette_size_bytes)[0]
+    palette_type, palette_size = _FLUID_HEADER.unpack_from(fluid_data, 0)
+    offset = _FLUID_HEADER.size
 
     # Read type palette
+    entry = _PALETTE_ENTRY_SHORT if palette_type == 3 else _PALETTE_ENTRY_BYTE
     type_palette = {}
     for i in range(palette_size):
         try:
-            if palette_type == 3:  # Short
-                internal_id = struct.unpack('>H', reader.read(2))[0]
-            else:
-                internal_id = struct.unpack('>B', reader.read(1))[0]
-
-            name_length = struct.unpack('>H', reader.read(2))[0]
-            fluid_name = reader.read(name_length).decode('utf-8')
-            count = struct.unpack('>H', reader.read(2))[0]
+            internal_id, name_length = entry.unpack_from(fluid_data, offset)
+            offset += entry.size
+            fluid_name = fluid_data[offset:offset + name_length].decode('utf-8')
+            offset += name_length
+            count = _PALETTE_COUNT.unpack_from(fluid_data, offset)[0]
+            offset += _PALETTE_COUNT.size
             type_palette[internal_id] = fluid_name
-        except:
+        except (struct.error, UnicodeDecodeError):
             # Malformed palette entry, return empty
             return type_palette, None, None, palette_type
 
-    # Read type data array based on palette type
-    if palette_type == 0:  # Empty
-        return type_palette, None, None, palette_type
-    elif palette_type == 1:  # HalfByte
-        type_array = reader.read(16384)
-    elif palette_type == 2:  # Byte
-        type_array = reader.read(32768)
-    elif palette_type == 3:  # Short
-        type_array = reader.read(65536)
-    else:
+    # Read type data array based on palette type (none for Empty or unknown types)
+    array_bytes = _ARRAY_BYTES[palette_type] if palette_type < len(_ARRAY_BYTES) else 0
+    if not array_bytes:
         return type_palette, None, None, palette_type
+    type_array = fluid_data[offset:offset + array_bytes]
+    offset += len(type_array)
 
     # Verify we got the expected array size
     if len(type_array) == 0:
         return type_palette, None, None, palette_type
 
     # Read level data array (ALWAYS 4-bit, 16384 bytes)
-    level_array = reader.read(16384)
+    level_array = fluid_data[offset:offset + 16384]
 
     # Verify we got the expected level array size
     if len(level_array) < 16384:
@@ -300,235 +416,233 @@ def parse_fluid_section(fluid_data):
     return type_palette, type_array, level_array, palette_type
 
 
-def get_fluid_at(type_palette, type_array, level_array, palette_type, x, y, z):
-    """Get fluid type and level at local coordinates (0-31)"""
-    if type_array is None or level_array is None:
-        return None, 0
-
-    # Calculate flat index (Y-Z-X ordering)
-    flat_idx = ((y & 31) << 10) | ((z & 31) << 5) | (x & 31)
-
-    # Get fluid type internal ID
-    if palette_type == 1:  # HalfByte
-        byte_idx = flat_idx // 2
-        if flat_idx % 2 == 0:
-            type_id = type_array[byte_idx] & 0x0F
-        else:
-            type_id = (type_array[byte_idx] >> 4) & 0x0F
-    elif palette_type == 2:  # Byte
-        type_id = type_array[flat_idx]
-    elif palette_type == 3:  # Short
-        type_id = struct.unpack('>H', type_array[flat_idx*2:flat_idx*2+2])[0]
-    else:
-        return None, 0
-
-    fluid_type = type_palette.get(type_id)
-    if not fluid_type or fluid_type == "Empty":
-        return None, 0
-
-    # Get fluid level (always 4-bit)
-    byte_idx = flat_idx // 2
-    if flat_idx % 2 == 0:
-        level = level_array[byte_idx] & 0x0F
-    else:
-        level = (level_array[byte_idx] >> 4) & 0x0F
-
-    return fluid_type, level
-
-
-def blend_fluid_color(terrain_color, fluid_type, fluid_level):
-    """Blend fluid color over terrain based on depth
-
-    Uses hardcoded colors:
-    - Water: #1983d9 (Zone1 default)
-    - Lava: #f94e11 (from Fluid_Lava.json ParticleColor)
-    """
-    if not fluid_type or fluid_level == 0:
-        return terrain_color
-
-    # Get base fluid color (hardcoded)
+def get_fluid_color(fluid_type):
+    """Get the hardcoded base color for a fluid type, or None if unknown"""
     if "Water" in fluid_type:
         # Zone1 WaterTint: #1983d9 = RGB(25, 131, 217)
-        fluid_color = (25, 131, 217)
+        return (25, 131, 217)
     elif "Lava" in fluid_type:
         # Lava ParticleColor: #f94e11 = RGB(249, 78, 17)
-        fluid_color = (249, 78, 17)
-    else:
-        # Unknown fluid, return terrain
-        return terrain_color
+        return (249, 78, 17)
+    return None
 
-    # Blend based on depth (level 0-15, higher = deeper)
-    # Algorithm from ImageBuilder.getFluidColor:
-    # depth_multiplier = min(1.0, 1.0 / fluid_level)
-    # final = fluid_color + (terrain_color - fluid_color) * depth_multiplier
-    depth_multiplier = min(1.0, 1.0 / max(1, fluid_level))
 
-    r = int(fluid_color[0] + (terrain_color[0] - fluid_color[0]) * depth_multiplier)
-    g = int(fluid_color[1] + (terrain_color[1] - fluid_color[1]) * depth_multiplier)
-    b = int(fluid_color[2] + (terrain_color[2] - fluid_color[2]) * depth_multiplier)
+def parse_block_sections(chunk_data):
+    """
+    Parse every block section in the chunk exactly once
+    Returns: list of (palette, blocks, palette_type), None where a section has no block data
+    """
+    block_sections = []
+    for section in chunk_data["Components"]["ChunkColumn"]["Sections"]:
+        if "Block" not in section["Components"]:
+            block_sections.append(None)
+            continue
 
-    # Clamp to valid range
-    r = min(255, max(0, r))
-    g = min(255, max(0, g))
-    b = min(255, max(0, b))
+        block_data = section["Components"]["Block"]["Data"]
+        block_sections.append(parse_block_section(block_data))
 
-    return (r, g, b)
+    return block_sections
 
 
-def find_surface_height(chunk_data, x, z):
+def parse_fluid_sections(chunk_data):
     """
-    Find the top solid block at column (x, z)
-    Returns: (height, block_name, section_index)
+    Parse every fluid section in the chunk exactly once
+    Returns: list of (type_palette, type_array, level_array, palette_type), None where a section
+    has no usable fluid data
     """
-    sections = chunk_data["Components"]["ChunkColumn"]["Sections"]
-
-    # Scan from top to bottom
-    for section_idx in range(9, -1, -1):  # Y sections 9 down to 0
-        section = sections[section_idx]
-
-        if "Block" not in section["Components"]:
+    fluid_sections = []
+    for section in chunk_data["Components"]["ChunkColumn"]["Sections"]:
+        if "Fluid" not in section["Components"]:
+            fluid_sections.append(None)
             continue
 
-        block_data = section["Components"]["Block"]["Data"]
-        palette, blocks_array, palette_type = parse_block_section(block_data)
-
-        if blocks_array is None:
+        fluid_data = section["Components"]["Fluid"].get("Data")
+        if not fluid_data or len(fluid_data) < 3:
+            fluid_sections.append(None)
             continue
 
-        # Check blocks in this section from top (Y=31) to bottom (Y=0)
-        for local_y in range(31, -1, -1):
-            block_name = get_block_at(palette, blocks_array, palette_type, x, local_y, z)
+        parsed = parse_fluid_section(fluid_data)
+        _, type_array, level_array, _ = parsed
+        fluid_sections.append(parsed if type_array is not None and level_array is not None else None)
 
-            # Skip air blocks
-            if block_name == "Empty" or block_name.startswith("*"):
-                continue
+    return fluid_sections
 
-            # Found solid block
-            world_y = section_idx * 32 + local_y
-            return world_y, block_name, section_idx
 
-    return 0, "Empty", 0
+if njit is not None:
+    @njit(cache=True)
+    def _scan_top_solid(blocks, air_mask, found):
+        """
+        Highest non-air Y per column of a [y, z, x] section in one compiled pass
 
+        Columns already resolved in `found`, or with no solid block, get -1.
+        """
+        top_y = np.full((32, 32), -1, dtype=np.int32)
+        for z in range(32):
+            for x in range(32):
+                if found[z, x]:
+                    continue
+                for y in range(31, -1, -1):
+                    if not air_mask[blocks[y, z, x]]:
+                        top_y[z, x] = y
+                        break
+        return top_y
+else:
+    _scan_top_solid = None
 
-def find_surface_fluid(chunk_data, x, z, surface_y):
-    """
-    Find the topmost fluid and calculate its depth from surface
-    Depth = (top of water column Y) - (surface block Y)
-    Returns: (fluid_type, fluid_depth)
-    """
-    sections = chunk_data["Components"]["ChunkColumn"]["Sections"]
 
-    fluid_type = None
-    topmost_fluid_y = None
+def _surface_hits(block_sections):
+    """
+    Scan the block sections top-down for the top solid block of every column
 
-    # Scan from top down to just above surface to find fluid column
-    for world_y in range(319, surface_y, -1):
-        section_idx = world_y // 32
+    Yields: (section_idx, palette, internal_ids, zs, xs, ys) for the columns whose
+    surface lies in each section, with local Y and internal block ID per column
+    """
+    found = np.zeros((32, 32), dtype=bool)
 
-        if section_idx >= len(sections):
+    # Scan sections from top to bottom, filling columns not yet resolved
+    for section_idx in range(9, -1, -1):  # Y sections 9 down to 0
+        parsed = block_sections[section_idx]
+        if parsed is None:
             continue
 
-        section = sections[section_idx]
-        if "Fluid" not in section["Components"]:
+        palette, blocks, palette_type = parsed
+        if blocks is None:
             continue
 
-        fluid_data = section["Components"]["Fluid"].get("Data")
-        if not fluid_data or len(fluid_data) < 3:
+        air_mask = np.array([is_air(name) for name in palette])
+        if air_mask.all():
+            # Nothing but air (open sky): no column can end in this section
             continue
+        if not air_mask.any():
+            # Nothing but solid blocks: every open column ends at the top layer
+            top_y = np.full((32, 32), 31)
+            hit = ~found
+        elif _scan_top_solid is not None:
+            top_y = _scan_top_solid(blocks, air_mask, found)
+            hit = top_y >= 0
+        else:
+            # Solidity mask over the whole section, [y, z, x]
+            solid = ~air_mask[blocks]
 
-        type_palette, type_array, level_array, palette_type = parse_fluid_section(fluid_data)
-
-        if type_array is None or level_array is None:
+            # Highest solid Y per column: first hit scanning the flipped Y axis
+            top_y = 31 - np.argmax(solid[::-1], axis=0)
+            hit = solid.any(axis=0) & ~found
+        if not hit.any():
             continue
 
-        local_y = world_y % 32
-        current_fluid, fluid_level = get_fluid_at(type_palette, type_array, level_array, palette_type, x, local_y, z)
+        zs, xs = np.nonzero(hit)
+        ys = top_y[zs, xs]
+        yield section_idx, palette, blocks[ys, zs, xs], zs, xs, ys
+        found |= hit
 
-        if current_fluid and fluid_level > 0:
-            if fluid_type is None:
-                # Found the topmost fluid
-                fluid_type = current_fluid
-                topmost_fluid_y = world_y
-            elif current_fluid != fluid_type:
-                # Different fluid type, stop
-                break
-        elif fluid_type is not None:
-            # Was in fluid, hit air/empty, stop
+        if found.all():
             break
 
-    if fluid_type and topmost_fluid_y is not None:
-        # Depth is distance from surface to top of water
-        fluid_depth = topmost_fluid_y - surface_y
-        return fluid_type, fluid_depth
 
-    return None, 0
+def find_surface_block_ids(block_sections):
+    """
+    Find the top solid block for every column in the chunk at once, identifying
+    the blocks by their row in the color table (see block_color_ids)
+    Args:
+        block_sections: Parsed sections from parse_block_sections()
+    Returns: (heights, block_ids) as 32x32 arrays indexed [z, x]
+    """
+    heights = np.zeros((32, 32), dtype=np.int32)
+    block_ids = np.full((32, 32), block_color_ids(["Empty"])[0], dtype=np.intp)
 
+    for section_idx, palette, internal_ids, zs, xs, ys in _surface_hits(block_sections):
+        heights[zs, xs] = section_idx * 32 + ys
 
-def get_block_color(block_name, biome_tint=None):
-    """
-    Get block color from block_properties.json with optional biome tinting
+        # Resolve each distinct palette entry on the surface once
+        unique_ids, inverse = np.unique(internal_ids, return_inverse=True)
+        rows = block_color_ids([name.decode('utf-8') for name in palette[unique_ids]])
+        block_ids[zs, xs] = rows[inverse]
 
-    Args:
-        block_name: Name of the block
-        biome_tint: Optional (r, g, b) tuple for biome tinting
+    return heights, block_ids
 
-    Returns:
-        (r, g, b) color tuple
+
+# Number of distinct internal IDs, indexed by palette type like _DECODERS
+_ID_RANGE = (0, 16, 256, 65536)
+
+
+def find_surface_fluids(fluid_sections, heights):
+    """
+    Find the topmost fluid and its depth for every column at once
+    Scans the fluid sections top-down one Y layer at a time, down to just above the surface.
+    A column's fluid ends at the first air/empty layer or different fluid type, and its
+    depth is the Y of the top of the fluid minus the surface Y
+    Args:
+        fluid_sections: Parsed sections from parse_fluid_sections()
+        heights: 32x32 surface heights indexed [z, x]
+    Returns: (fluid_types, fluid_depths) as 32x32 arrays indexed [z, x], with fluid type ""
+    and depth 0 where a column has no fluid
     """
-    if block_name == "Empty":
-        return (0, 0, 0)
+    fluid_names = [""]  # fluid ID -> name, 0 = no fluid
+    fluid_ids = np.zeros((32, 32), dtype=np.int64)
+    top_y = np.zeros((32, 32), dtype=np.int32)
+    done = np.zeros((32, 32), dtype=bool)
+
+    for section_idx in range(min(len(fluid_sections), 10) - 1, -1, -1):
+        parsed = fluid_sections[section_idx]
+        if parsed is None:
+            continue
 
-    # Load properties
-    properties = load_block_properties()
+        # Map this section's internal type IDs to fluid IDs (0 for Empty/unknown)
+        type_palette, type_array, level_array, palette_type = parsed
+        type_lut = np.zeros(_ID_RANGE[palette_type], dtype=np.int64)
+        for internal_id, fluid_name in type_palette.items():
+            if fluid_name and fluid_name != "Empty" and internal_id < type_lut.size:
+                if fluid_name not in fluid_names:
+                    fluid_names.append(fluid_name)
+                type_lut[internal_id] = fluid_names.index(fluid_name)
 
-    base_color = None
-    biome_tint_percent = 0
-    particle_color = None
+        for local_y in range(31, -1, -1):
+            world_y = section_idx * 32 + local_y
 
-    # Check exact match
-    if block_name in properties:
-        block_props = properties[block_name]
+            # Columns still scanning: above their surface and not yet stopped
+            scanning = ~done & (world_y > heights)
+            if not scanning.any():
+                break
 
-        # Get TintUp as base color if available
-        if block_props.get("TintUp"):
-            base_color = hex_to_rgb(block_props["TintUp"][0])
-            biome_tint_percent = block_props.get("BiomeTintUp", 0)
+            layer_ids = type_lut[decode_plane(type_array, palette_type, local_y)]
+            in_fluid = (layer_ids != 0) & (decode_plane(level_array, 1, local_y) > 0)
 
-        # Get ParticleColor if available
-        if block_props.get("ParticleColor"):
-            pc = hex_to_rgb(block_props["ParticleColor"])
-            if pc:
-                particle_color = pc
+            # Stop where a fluid column hits air/empty or a different fluid type
+            in_column = scanning & (fluid_ids != 0)
+            done |= in_column & (~in_fluid | (layer_ids != fluid_ids))
 
-        # If no TintUp, use ParticleColor as base
-        if not base_color and particle_color:
-            base_color = particle_color
-            particle_color = None  # Don't multiply twice
+            # Record the topmost fluid of columns that have not seen one yet
+            found = scanning & (fluid_ids == 0) & in_fluid
+            fluid_ids[found] = layer_ids[found]
+            top_y[found] = world_y
+
+    fluid_types = np.array(fluid_names, dtype=object)[fluid_ids]
+    fluid_depths = np.where(fluid_ids != 0, top_y - heights, 0)
+    return fluid_types, fluid_depths
 
-    # Try partial matches (for blocks with state suffixes)
-    if not base_color:
-        for key in properties:
-            if block_name.startswith(key):
-                block_props = properties[key]
 
-                # Get TintUp as base color
-                if block_props.get("TintUp"):
-                    base_color = hex_to_rgb(block_props["TintUp"][0])
-                    biome_tint_percent = block_props.get("BiomeTintUp", 0)
+@functools.lru_cache(maxsize=None)
+def resolve_block_color(block_name):
+    """
+    Resolve the tint-independent color properties of a block (cached per name)
+
+    Runs the exact match, prefix match and fallback rules against the
+    block color table once per distinct block name.
 
-                # Get ParticleColor
-                if block_props.get("ParticleColor"):
-                    pc = hex_to_rgb(block_props["ParticleColor"])
-                    if pc:
-                        particle_color = pc
+    Returns:
+        (base_color, biome_tint_percent, particle_color)
+    """
+    lut = load_block_lut()
 
-                # If no TintUp, use ParticleColor as base
-                if not base_color and particle_color:
-                    base_color = particle_color
-                    particle_color = None
+    # Check exact match, then partial matches (for blocks with state suffixes)
+    block_id = lut["ids"].get(block_name)
+    if block_id is None or lut["colors"][block_id] is None:
+        block_id = next((i for key, i in lut["prefixes"] if block_name.startswith(key)), None)
 
-                if base_color:
-                    break
+    if block_id is not None:
+        base_color, biome_tint_percent, particle_color = lut["colors"][block_id]
+    else:
+        base_color, biome_tint_percent, particle_color = None, 0, None
 
     # Fallback colors
     if not base_color:
@@ -552,29 +666,80 @@ def get_block_color(block_name, biome_tint=None):
             print(f"Warning: Using default gray for unknown block '{block_name}'")
             base_color = (128, 128, 128)
 
-    # Apply biome tinting if available
-    if biome_tint and biome_tint_percent > 0:
-        multiplier = biome_tint_percent / 100.0
-        r = int(base_color[0] * (1.0 - multiplier) + biome_tint[0] * multiplier)
-        g = int(base_color[1] * (1.0 - multiplier) + biome_tint[1] * multiplier)
-        b = int(base_color[2] * (1.0 - multiplier) + biome_tint[2] * multiplier)
-        base_color = (r, g, b)
+    return base_color, biome_tint_percent, particle_color
 
-        # Apply ParticleColor ONLY if biome tint < 100%
+
+def block_color_ids(names):
+    """
+    Map block names to rows of the process-wide resolved color table
+
+    Names not seen before are resolved once and appended to the table.
+
+    Returns: intp array of row ids, one per name
+    """
+    global _color_table
+    missing = set(names).difference(_color_ids)
+    if missing:
+        for name in sorted(missing):
+            _color_ids[name] = len(_color_rows)
+            _color_rows.append(((0, 0, 0), 0, None) if name == "Empty" else resolve_block_color(name))
+
+        # Rebuild the (base, biome tint percent, particle, has particle) arrays
+        _color_table = (
+            np.array([base for base, _, _ in _color_rows], dtype=np.float64),
+            np.array([percent for _, percent, _ in _color_rows], dtype=np.float64),
+            np.array([particle or (0, 0, 0) for _, _, particle in _color_rows], dtype=np.int64),
+            np.array([particle is not None for _, _, particle in _color_rows]),
+        )
+    return np.fromiter(map(_color_ids.__getitem__, names), dtype=np.intp, count=len(names))
+
+
+def get_block_colors_by_id(name_ids, biome_tints=None, tint_valid=None):
+    """
+    Get block colors with optional biome tinting, for blocks given as color table
+    rows (see block_color_ids)
+
+    Args:
+        name_ids: Array of color table rows
+        biome_tints: Optional matching array of (r, g, b) biome tints (extra last axis)
+        tint_valid: Optional matching bool array, False where there is no biome tint
+
+    Returns:
+        int64 array of (r, g, b) colors shaped like name_ids plus a last axis of 3
+    """
+    # Gather the tint-independent properties from the color table by row id
+    base, percent, particle, has_particle = _color_table
+
+    colors = base[name_ids]
+    percent = percent[name_ids]
+    apply_particle = has_particle[name_ids]
+
+    # Apply biome tinting if available: blend toward the tint by the block's
+    # BiomeTintUp percent, truncating like int()
+    if biome_tints is not None:
+        tinted = percent > 0
+        if tint_valid is not None:
+            tinted &= tint_valid
+        multiplier = (percent / 100.0)[..., None]
+        blended = np.trunc(colors * (1.0 - multiplier) + biome_tints * multiplier)
+        colors = np.where(tinted[..., None], blended, colors)
+
+        # ParticleColor is only applied when the biome tint is below 100%
         # (as per map_renderer.py line 168: "if particle_color_str and biome_tint_multiplier < 1.0")
-        if particle_color and multiplier < 1.0:
-            r = (base_color[0] * particle_color[0]) // 255
-            g = (base_color[1] * particle_color[1]) // 255
-            b = (base_color[2] * particle_color[2]) // 255
-            base_color = (r, g, b)
-    elif particle_color:
-        # No biome tinting, just apply ParticleColor
-        r = (base_color[0] * particle_color[0]) // 255
-        g = (base_color[1] * particle_color[1]) // 255
-        b = (base_color[2] * particle_color[2]) // 255
-        base_color = (r, g, b)
+        apply_particle &= ~tinted | (percent / 100.0 < 1.0)
 
-    return base_color
+    colors = colors.astype(np.int64)
+    tinted_particle = (colors * particle[name_ids]) // 255
+    return np.where(apply_particle[..., None], tinted_particle, colors)
+
+
+# Light direction (from top-left-front), normalized once
+_INV_L = 1.0 / math.sqrt(-0.2 * -0.2 + 0.8 * 0.8 + 0.5 * 0.5)
+_LX, _LY, _LZ = -0.2 * _INV_L, 0.8 * _INV_L, 0.5 * _INV_L
+
+# Vertical scale factor of the surface normal, and its square
+_DY = 3.0
+_DY2 = _DY * _DY
 
 
 def calculate_shading(height, neighbors, pixel_x=0.5, pixel_z=0.5):
@@ -612,33 +777,19 @@ def calculate_shading(height, neighbors, pixel_x=0.5, pixel_z=0.5):
     dhdx = dhdx1 * 2.0 + dhdx2
     dhdz = dhdz1 * 2.0 + dhdz2
 
-    # Vertical scale factor
-    dy = 3.0
-
     # Compute surface normal from gradients
     nx = dhdx
-    ny = dy
+    ny = _DY
     nz = dhdz
 
     # Normalize the normal vector
-    inv_s = 1.0 / math.sqrt(nx * nx + ny * ny + nz * nz)
+    inv_s = 1.0 / math.sqrt(nx * nx + _DY2 + nz * nz)
     nx *= inv_s
     ny *= inv_s
     nz *= inv_s
 
-    # Light direction (from top-left-front)
-    lx = -0.2
-    ly = 0.8
-    lz = 0.5
-
-    # Normalize light direction
-    inv_l = 1.0 / math.sqrt(lx * lx + ly * ly + lz * lz)
-    lx *= inv_l
-    ly *= inv_l
-    lz *= inv_l
-
     # Lambert diffuse lighting (dot product)
-    lambert = max(0.0, nx * lx + ny * ly + nz * lz)
+    lambert = max(0.0, nx * _LX + ny * _LY + nz * _LZ)
 
     # Final shading: 40% ambient + 60% diffuse
     ambient = 0.4
@@ -646,6 +797,331 @@ def calculate_shading(height, neighbors, pixel_x=0.5, pixel_z=0.5):
     return ambient + diffuse * lambert
 
 
+def neighbor_heights(heights):
+    """
+    Get the 8 neighbor heights of every block in a 32x32 heightmap
+
+    Neighbors outside the chunk fall back to the block's own height.
+    Returns: (N, S, W, E, NW, NE, SW, SE) as 32x32 float arrays
+    """
+    center = np.asarray(heights, dtype=np.float64)
+    padded = np.pad(center, 1, constant_values=np.nan)
+
+    def shifted(dz, dx):
+        neighbor = padded[1 + dz:33 + dz, 1 + dx:33 + dx]
+        return np.where(np.isnan(neighbor), center, neighbor)
+
+    return (shifted(-1, 0), shifted(1, 0), shifted(0, -1), shifted(0, 1),
+            shifted(-1, -1), shifted(-1, 1), shifted(1, -1), shifted(1, 1))
+
+
+@functools.lru_cache(maxsize=None)
+def subpixel_weights(pixels_per_block):
+    """
+    Bilinear weights of calculate_shading() for every sub-pixel position (cached per resolution)
+
+    The weights depend only on the position within a block, so they are shared
+    by every block of every chunk.
+
+    Returns: read-only (pixels_per_block, pixels_per_block, 8) array indexed
+        [sub_z, sub_x] of (1 - u, u, 1 - v, v, 1 - ud, ud, 1 - vd, vd)
+    """
+    offsets = (np.arange(pixels_per_block) + 0.5) / pixels_per_block
+    u = offsets[None, :]
+    v = offsets[:, None]
+
+    # Diagonal coordinates for diagonal gradient sampling
+    ud = (u + v) / 2.0
+    vd = (1.0 - u + v) / 2.0
+
+    weights = np.stack(np.broadcast_arrays(1.0 - u, u, 1.0 - v, v, 1.0 - ud, ud, 1.0 - vd, vd), axis=-1)
+    weights.flags.writeable = False
+    return weights
+
+
+if njit is not None:
+    @njit(cache=True)
+    def _shade_block(heights, z, x, weights, out, row, col):
+        """
+        Compiled calculate_shading() for every sub-pixel of block (z, x) of a 32x32
+        heightmap, written to out[row:row + ppb, col:col + ppb]
+
+        Missing neighbors at the chunk edge fall back to the center height.
+        """
+        height = heights[z, x]
+        n = heights[z - 1, x] if z > 0 else height
+        s = heights[z + 1, x] if z < 31 else height
+        w = heights[z, x - 1] if x > 0 else height
+        e = heights[z, x + 1] if x < 31 else height
+        nw = heights[z - 1, x - 1] if z > 0 and x > 0 else height
+        ne = heights[z - 1, x + 1] if z > 0 and x < 31 else height
+        sw = heights[z + 1, x - 1] if z < 31 and x > 0 else height
+        se = heights[z + 1, x + 1] if z < 31 and x < 31 else height
+
+        for sub_z in range(weights.shape[0]):
+            for sub_x in range(weights.shape[1]):
+                wt = weights[sub_z, sub_x]
+
+                # Same math as calculate_shading()
+                dhdx1 = (height - w) * wt[0] + (e - height) * wt[1]
+                dhdz1 = (height - n) * wt[2] + (s - height) * wt[3]
+
+                dhdx2 = (height - nw) * wt[4] + (se - height) * wt[5]
+                dhdz2 = (height - ne) * wt[6] + (sw - height) * wt[7]
+
+                nx = dhdx1 * 2.0 + dhdx2
+                ny = _DY
+                nz = dhdz1 * 2.0 + dhdz2
+
+                inv_s = 1.0 / np.sqrt(nx * nx + _DY2 + nz * nz)
+                nx = nx * inv_s
+                ny = ny * inv_s
+                nz = nz * inv_s
+
+                lambert = max(0.0, nx * _LX + ny * _LY + nz * _LZ)
+                out[row + sub_z, col + sub_x] = 0.4 + 0.6 * lambert
+
+    @njit(cache=True)
+    def _shade_grid(heights, weights):
+        """calculate_shading() for every sub-pixel of a 32x32 heightmap in one compiled loop"""
+        pixels_per_block = weights.shape[0]
+        size = 32 * pixels_per_block
+        shade = np.empty((size, size))
+        for z in range(32):
+            for x in range(32):
+                _shade_block(heights, z, x, weights, shade, z * pixels_per_block, x * pixels_per_block)
+        return shade
+else:
+    _shade_block = None
+    _shade_grid = None
+
+
+def calculate_shading_grid(heights, pixels_per_block):
+    """
+    Vectorized calculate_shading() for every sub-pixel of a 32x32 heightmap
+
+    Returns: (32 * pixels_per_block, 32 * pixels_per_block) array of shading multipliers
+    """
+    weights = subpixel_weights(pixels_per_block)
+    if _shade_grid is not None:
+        return _shade_grid(np.asarray(heights, dtype=np.float64), weights)
+
+    # Broadcast blocks as [z, 1, x, 1] against sub-pixels as [1, sub_z, 1, sub_x]
+    height = np.asarray(heights, dtype=np.float64)[:, None, :, None]
+    n, s, w, e, nw, ne, sw, se = (nb[:, None, :, None] for nb in neighbor_heights(heights))
+    # u only varies along sub_x and v along sub_z, which keeps those products small
+    weights = weights[None, :, None, :]
+    one_minus_u, u = weights[:, :1, :, :, 0], weights[:, :1, :, :, 1]
+    one_minus_v, v = weights[:, :, :, :1, 2], weights[:, :, :, :1, 3]
+    one_minus_ud, ud, one_minus_vd, vd = (weights[..., i] for i in range(4, 8))
+
+    # Same math as calculate_shading()
+    dhdx1 = (height - w) * one_minus_u + (e - height) * u
+    dhdz1 = (height - n) * one_minus_v + (s - height) * v
+
+    dhdx2 = (height - nw) * one_minus_ud + (se - height) * ud
+    dhdz2 = (height - ne) * one_minus_vd + (sw - height) * vd
+
+    nx = dhdx1 * 2.0 + dhdx2
+    ny = _DY
+    nz = dhdz1 * 2.0 + dhdz2
+
+    inv_s = 1.0 / np.sqrt(nx * nx + _DY2 + nz * nz)
+    nx = nx * inv_s
+    ny = ny * inv_s
+    nz = nz * inv_s
+
+    lambert = np.maximum(0.0, nx * _LX + ny * _LY + nz * _LZ)
+    shade = 0.4 + 0.6 * lambert
+
+    size = 32 * pixels_per_block
+    return shade.reshape(size, size)
+
+
+def per_block(grid):
+    """View a [z, x, ...] grid as [z, 1, x, 1, ...] so it broadcasts over each block's sub-pixels"""
+    return grid[:, None, :, None]
+
+
+@dataclass(frozen=True)
+class ChunkSurface:
+    """
+    Everything the renderer reads from a chunk, as 32x32 arrays indexed [z, x]
+
+    The arrays are read-only, since parsed chunks are shared through parse_chunk's cache.
+    """
+    heights: np.ndarray             # int32 surface Y from the BlockChunk heightmap
+    block_ids: np.ndarray           # surface blocks as color table rows (see block_color_ids)
+    biome_tints: np.ndarray         # uint8 (r, g, b) per column
+    tint_valid: np.ndarray          # False for columns without biome tint data
+    fluid_types: np.ndarray         # surface fluid name per column, "" for none
+    fluid_depths: np.ndarray        # fluid depth above the surface per column
+
+
+@functools.lru_cache(maxsize=256)
+def _parse_chunk(base_path, chunk_x, chunk_z):
+    # Runs once per cached chunk, possibly in a worker process: never prints
+    chunk_data = read_chunk_data(chunk_x, chunk_z, quiet=True)
+    if chunk_data is None:
+        return None
+
+    # Parse heightmap and biome tints
+    parsed_data = parse_biome_tints(chunk_data)
+    if parsed_data is None:
+        return None
+
+    heights, biome_tints, tint_valid = parsed_data
+
+    # Get the block at each surface position
+    _, block_ids = find_surface_block_ids(parse_block_sections(chunk_data))
+
+    # Find the surface fluid of every column in one pass over the fluid sections
+    fluid_types, fluid_depths = find_surface_fluids(parse_fluid_sections(chunk_data), heights)
+
+    arrays = (heights, block_ids, biome_tints, tint_valid, fluid_types, fluid_depths)
+    for array in arrays:
+        array.flags.writeable = False
+    return ChunkSurface(*arrays)
+
+
+def parse_chunk(chunk_x, chunk_z, quiet=False):
+    """
+    Read and parse everything the renderer needs from a chunk (cached)
+
+    Parsed chunks are kept for the most recently used chunks of the current
+    BASE_PATH, so re-rendering a chunk (another resolution, shading on or off)
+    skips decompression and parsing.
+
+    Args:
+        quiet: Don't report why a chunk could not be read
+
+    Returns: ChunkSurface, or None if the chunk could not be read
+    """
+    surface = _parse_chunk(BASE_PATH, chunk_x, chunk_z)
+    if surface is None and not quiet:
+        # The cached parse is silent; read the chunk again to report why it failed
+        if read_chunk_data(chunk_x, chunk_z) is not None:
+            print(f"Warning: No chunk data found for chunk ({chunk_x}, {chunk_z})")
+    return surface
+
+
+if njit is not None:
+    @njit(cache=True)
+    def _render_tile(heights, base_colors, fluid_colors, depth_multipliers, has_fluid,
+                     weights, enable_shading):
+        """
+        Shade, clamp and fluid-blend every sub-pixel of a chunk in one compiled pass
+
+        Follows the NumPy path of render_chunk_to_array() operation for operation,
+        without materializing the intermediate full-size arrays.
+        """
+        pixels_per_block = weights.shape[0]
+        size = 32 * pixels_per_block
+        out = np.empty((size, size, 3), dtype=np.uint8)
+        # Unshaded renders keep the shade at exactly 1.0, so the inner loop needs
+        # no shading branch
+        shade = np.ones((pixels_per_block, pixels_per_block))
+        for z in range(32):
+            for x in range(32):
+                if enable_shading:
+                    _shade_block(heights, z, x, weights, shade, 0, 0)
+                for sub_z in range(pixels_per_block):
+                    for sub_x in range(pixels_per_block):
+                        for c in range(3):
+                            value = base_colors[z, x, c] * shade[sub_z, sub_x]
+                            value = min(max(np.trunc(value), 0.0), 255.0)
+
+                            # Blend fluid over the shaded terrain by depth
+                            if has_fluid[z, x]:
+                                fluid = fluid_colors[z, x, c]
+                                value = np.trunc(fluid + (value - fluid) * depth_multipliers[z, x])
+                                value = min(max(value, 0.0), 255.0)
+
+                            out[z * pixels_per_block + sub_z, x * pixels_per_block + sub_x, c] = np.uint8(value)
+        return out
+else:
+    _render_tile = None
+
+
+def render_chunk_to_array(chunk_x, chunk_z, pixels_per_block=2, enable_shading=True, quiet=False):
+    """
+    Render a chunk to an RGB pixel array
+
+    Args:
+        chunk_x: Chunk X coordinate (world_x // 32)
+        chunk_z: Chunk Z coordinate (world_z // 32)
+        pixels_per_block: Resolution multiplier (1=32x32, 2=64x64, etc.)
+        enable_shading: Whether to apply terrain shading (default True)
+        quiet: Suppress progress output and read errors
+
+    Returns: (32 * pixels_per_block, 32 * pixels_per_block, 3) uint8 array indexed [z, x],
+        or None if the chunk could not be read
+    """
+    # Read and parse the chunk's heightmap, tints, surface blocks and fluids
+    if not quiet: print("Parsing chunk...")
+    surface = parse_chunk(chunk_x, chunk_z, quiet)
+    if surface is None:
+        return None
+
+    heights = surface.heights
+    fluid_types = surface.fluid_types
+    fluid_depths = surface.fluid_depths
+
+    # Get base colors with biome tinting
+    if not quiet: print(f"Rendering image at {pixels_per_block}x resolution...")
+    base_colors = get_block_colors_by_id(surface.block_ids, surface.biome_tints, surface.tint_valid)
+
+    # Fluid colors per distinct type, and depth multipliers for every block at once
+    # (ImageBuilder.getFluidColor: final = fluid + (terrain - fluid) * min(1, 1 / depth))
+    type_names, type_ids = np.unique(fluid_types, return_inverse=True)
+    type_colors = [get_fluid_color(name) if name else None for name in type_names]
+    known_type = np.array([color is not None for color in type_colors])
+    type_palette = np.array([color or (0, 0, 0) for color in type_colors], dtype=np.float64)
+
+    type_ids = type_ids.reshape(32, 32)
+    fluid_colors = type_palette[type_ids]
+    depth_multipliers = np.minimum(1.0, 1.0 / np.maximum(1, fluid_depths))
+    has_fluid = known_type[type_ids] & (fluid_depths > 0)
+
+    size = 32 * pixels_per_block
+    if _render_tile is not None:
+        # Without shading every block is one flat color: render each block once
+        # and upscale below
+        rgb = _render_tile(np.asarray(heights, dtype=np.float64), base_colors, fluid_colors,
+                           depth_multipliers, has_fluid, subpixel_weights(pixels_per_block if enable_shading else 1),
+                           enable_shading)
+        if enable_shading:
+            return rgb
+    else:
+        # Build the image as one [z, sub_z, x, sub_x, rgb] array; per-block values
+        # broadcast over their sub-pixels instead of being repeated up front
+        rgb = per_block(base_colors)
+        if enable_shading:
+            shade = calculate_shading_grid(heights, pixels_per_block)
+            shade = shade.reshape(32, pixels_per_block, 32, pixels_per_block)
+            rgb = rgb * shade[..., None]
+            np.trunc(rgb, out=rgb)
+
+        # Clamp the terrain colors once for the whole image
+        np.clip(rgb, 0, 255, out=rgb)
+
+        # Blend fluid over the shaded terrain by depth
+        fluid_rgb = per_block(fluid_colors)
+        blended = fluid_rgb + (rgb - fluid_rgb) * per_block(depth_multipliers)[..., None]
+        np.trunc(blended, out=blended)
+        np.clip(blended, 0, 255, out=blended)
+        rgb = np.where(per_block(has_fluid)[..., None], blended, rgb)
+
+        if enable_shading:
+            return rgb.reshape(size, size, 3).astype(np.uint8)
+        rgb = rgb.reshape(32, 32, 3).astype(np.uint8)
+
+    # Flat colors are constant per block, so let PIL replicate the 32x32 pixels
+    if pixels_per_block == 1:
+        return rgb
+    return np.asarray(Image.fromarray(rgb).resize((size, size), Image.NEAREST))
+
+
 def render_chunk(chunk_x, chunk_z, output_path="chunk.png", pixels_per_block=2, enable_shading=True):
     """
     Render a chunk to a PNG image
@@ -659,86 +1135,11 @@ def render_chunk(chunk_x, chunk_z, output_path="chunk.png", pixels_per_block=2,
     """
     print(f"Rendering chunk ({chunk_x}, {chunk_z})...")
 
-    # Read chunk data
-    chunk_data = read_chunk_data(chunk_x, chunk_z)
-    if chunk_data is None:
-        return
-
-    # Parse heightmap and biome tints
-    print("Parsing heightmap and biome tints...")
-    parsed_data = parse_biome_tints(chunk_data)
-    if parsed_data is None:
-        print("Warning: No chunk data found")
+    rgb = render_chunk_to_array(chunk_x, chunk_z, pixels_per_block, enable_shading)
+    if rgb is None:
         return
 
-    heights, biome_tints = parsed_data
-
-    # Get block names at each surface position
-    print("Reading surface blocks...")
-    blocks = [["Empty" for _ in range(32)] for _ in range(32)]
-    for z in range(32):
-        for x in range(32):
-            height = heights[z][x]
-            # Get block at this height
-            _, block_name, _ = find_surface_height(chunk_data, x, z)
-            blocks[z][x] = block_name
-
-    # Create image
-    print(f"Rendering image at {pixels_per_block}x resolution...")
-    img_size = 32 * pixels_per_block
-    img = Image.new('RGB', (img_size, img_size))
-    pixels = img.load()
-
-    for z in range(32):
-        for x in range(32):
-            height = heights[z][x]
-            block_name = blocks[z][x]
-
-            # Get biome tint for this position
-            biome_tint = biome_tints[z][x] if biome_tints else None
-
-            # Get base color with biome tinting
-            base_r, base_g, base_b = get_block_color(block_name, biome_tint)
-
-            # Get neighbor heights for shading
-            n = heights[z-1][x] if z > 0 else height
-            s = heights[z+1][x] if z < 31 else height
-            w = heights[z][x-1] if x > 0 else height
-            e = heights[z][x+1] if x < 31 else height
-            nw = heights[z-1][x-1] if z > 0 and x > 0 else height
-            ne = heights[z-1][x+1] if z > 0 and x < 31 else height
-            sw = heights[z+1][x-1] if z < 31 and x > 0 else height
-            se = heights[z+1][x+1] if z < 31 and x < 31 else height
-
-            # Check for fluid once per block
-            fluid_type, fluid_depth = find_surface_fluid(chunk_data, x, z, height)
-
-            # Render each pixel within this block
-            for sub_z in range(pixels_per_block):
-                for sub_x in range(pixels_per_block):
-                    # Calculate sub-pixel position (0.0 to 1.0)
-                    pixel_x = (sub_x + 0.5) / pixels_per_block
-                    pixel_z = (sub_z + 0.5) / pixels_per_block
-
-                    # Calculate shading with sub-pixel position
-                    if enable_shading:
-                        shade = calculate_shading(height, (n, s, w, e, nw, ne, sw, se), pixel_x, pixel_z)
-                    else:
-                        shade = 1.0
-
-                    # Apply shading
-                    r = int(min(255, base_r * shade))
-                    g = int(min(255, base_g * shade))
-                    b = int(min(255, base_b * shade))
-
-                    # Apply fluid if present
-                    if fluid_type and fluid_depth > 0:
-                        r, g, b = blend_fluid_color((r, g, b), fluid_type, fluid_depth)
-
-                    # Set pixel in image
-                    pixel_img_x = x * pixels_per_block + sub_x
-                    pixel_img_z = z * pixels_per_block + sub_z
-                    pixels[pixel_img_x, pixel_img_z] = (r, g, b)
+    img = Image.fromarray(rgb)
 
     # Save image
     img.save(output_path)
@@ -2,13 +2,90 @@
 """
 Renders multiple chunks into a single map image
 """
+import os
 import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
 from PIL import Image
-from render_chunk import read_chunk_data, find_surface_height, find_surface_fluid
-from render_chunk import get_block_color, calculate_shading, blend_fluid_color, parse_biome_tints
+import render_chunk
+from render_chunk import render_chunk_to_array
 
+try:
+    import png
+except ImportError:  # pypng is optional; without it the whole map is saved through Pillow
+    png = None
 
-def render_map(start_x, start_z, end_x, end_z, output_path="map.png", pixels_per_block=2, enable_shading=True):
+
+def _init_worker(base_path):
+    """Point a worker process at the world being rendered"""
+    render_chunk.BASE_PATH = base_path
+
+
+def _render_tile(task):
+    """Render one chunk in a worker process"""
+    chunk_x, chunk_z, pixels_per_block, enable_shading = task
+    return render_chunk_to_array(chunk_x, chunk_z, pixels_per_block, enable_shading, quiet=True)
+
+
+def render_rows(start_x, start_z, end_x, end_z, pixels_per_block=2, enable_shading=True, max_workers=None):
+    """
+    Render a range of chunks on a process pool, one row of chunks at a time
+
+    Chunks are rendered in parallel, one worker task per chunk, and assembled
+    into contiguous row strips in order. Only a few rows are queued ahead of the
+    one being yielded, so memory stays bounded for maps of any height.
+
+    Yields: (chunk_z, strip) where strip is a (32 * pixels_per_block,
+        chunks_width * 32 * pixels_per_block, 3) uint8 array indexed [z, x];
+        missing chunks stay black
+    """
+    chunks_width = end_x - start_x + 1
+    chunk_size = 32 * pixels_per_block
+    strip_width = chunks_width * chunk_size
+
+    # Keep enough chunks queued to occupy every worker twice over
+    workers = max_workers or os.cpu_count() or 1
+    rows_ahead = -(-2 * workers // chunks_width)
+
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                             initargs=(render_chunk.BASE_PATH,)) as executor:
+        rows = iter(range(start_z, end_z + 1))
+        pending = deque()
+
+        def submit_row():
+            chunk_z = next(rows, None)
+            if chunk_z is not None:
+                pending.append((chunk_z, [
+                    executor.submit(_render_tile, (chunk_x, chunk_z, pixels_per_block, enable_shading))
+                    for chunk_x in range(start_x, end_x + 1)
+                ]))
+
+        for _ in range(rows_ahead + 1):
+            submit_row()
+
+        while pending:
+            chunk_z, futures = pending.popleft()
+            submit_row()
+
+            print(f"Rendering chunk row z={chunk_z}...")
+            strip = np.zeros((chunk_size, strip_width, 3), dtype=np.uint8)
+
+            for chunk_x, future in zip(range(start_x, end_x + 1), futures):
+                tile = future.result()
+                if tile is None:
+                    print(f"  Chunk ({chunk_x}, {chunk_z}) could not be rendered, skipping")
+                    continue
+
+                # Place the chunk tile in the strip
+                pixel_x = (chunk_x - start_x) * chunk_size
+                strip[:, pixel_x:pixel_x + chunk_size] = tile
+
+            yield chunk_z, strip
+
+
+def render_map(start_x, start_z, end_x, end_z, output_path="map.png", pixels_per_block=2, enable_shading=True,
+               max_workers=None):
     """
     Render a range of chunks into a single map image
 
@@ -20,6 +97,7 @@ def render_map(start_x, start_z, end_x, end_z, output_path="map.png", pixels_per
         output_path: Output PNG file path
         pixels_per_block: Resolution multiplier (1=32px/chunk, 2=64px/chunk, etc.)
         enable_shading: Whether to apply terrain shading (default True)
+        max_workers: Number of worker processes (default: one per CPU)
     """
     chunks_width = end_x - start_x + 1
     chunks_height = end_z - start_z + 1
@@ -28,98 +106,31 @@ def render_map(start_x, start_z, end_x, end_z, output_path="map.png", pixels_per
     print(f"Chunk range: ({start_x}, {start_z}) to ({end_x}, {end_z})")
     print(f"Resolution: {pixels_per_block}x pixels per block")
 
-    # Create output image
-    img_width = chunks_width * 32 * pixels_per_block
-    img_height = chunks_height * 32 * pixels_per_block
-    img = Image.new('RGB', (img_width, img_height))
-    pixels = img.load()
-
-    # Render each chunk
-    for chunk_z in range(start_z, end_z + 1):
-        for chunk_x in range(start_x, end_x + 1):
-            print(f"Rendering chunk ({chunk_x}, {chunk_z})...")
-
-            # Read chunk data
-            chunk_data = read_chunk_data(chunk_x, chunk_z)
-            if chunk_data is None:
-                print(f"  Chunk ({chunk_x}, {chunk_z}) not found, skipping")
-                continue
-
-            # Parse heightmap and biome tints
-            parsed_data = parse_biome_tints(chunk_data)
-            if parsed_data is None:
-                print(f"  Chunk ({chunk_x}, {chunk_z}) has no data, skipping")
-                continue
-
-            heights, biome_tints = parsed_data
-
-            # Get block names at each surface position
-            blocks = [["Empty" for _ in range(32)] for _ in range(32)]
-            for z in range(32):
-                for x in range(32):
-                    height = heights[z][x]
-                    # Get block at this height
-                    _, block_name, _ = find_surface_height(chunk_data, x, z)
-                    blocks[z][x] = block_name
-
-            # Render pixels for this chunk
-            for z in range(32):
-                for x in range(32):
-                    height = heights[z][x]
-                    block_name = blocks[z][x]
-
-                    # Get biome tint for this position
-                    biome_tint = biome_tints[z][x] if biome_tints else None
-
-                    # Get base color with biome tinting
-                    base_r, base_g, base_b = get_block_color(block_name, biome_tint)
-
-                    # Get neighbor heights for shading
-                    n = heights[z-1][x] if z > 0 else height
-                    s = heights[z+1][x] if z < 31 else height
-                    w = heights[z][x-1] if x > 0 else height
-                    e = heights[z][x+1] if x < 31 else height
-                    nw = heights[z-1][x-1] if z > 0 and x > 0 else height
-                    ne = heights[z-1][x+1] if z > 0 and x < 31 else height
-                    sw = heights[z+1][x-1] if z < 31 and x > 0 else height
-                    se = heights[z+1][x+1] if z < 31 and x < 31 else height
-
-                    # Check for fluid once per block
-                    fluid_type, fluid_depth = find_surface_fluid(chunk_data, x, z, height)
-
-                    # Render each pixel within this block
-                    for sub_z in range(pixels_per_block):
-                        for sub_x in range(pixels_per_block):
-                            # Calculate sub-pixel position (0.0 to 1.0)
-                            pixel_x = (sub_x + 0.5) / pixels_per_block
-                            pixel_z = (sub_z + 0.5) / pixels_per_block
-
-                            # Calculate shading with sub-pixel position
-                            if enable_shading:
-                                shade = calculate_shading(height, (n, s, w, e, nw, ne, sw, se), pixel_x, pixel_z)
-                            else:
-                                shade = 1.0
-
-                            # Apply shading
-                            r = int(min(255, base_r * shade))
-                            g = int(min(255, base_g * shade))
-                            b = int(min(255, base_b * shade))
-
-                            # Apply fluid if present
-                            if fluid_type and fluid_depth > 0:
-                                r, g, b = blend_fluid_color((r, g, b), fluid_type, fluid_depth)
-
-                            # Calculate pixel position in final image
-                            pixel_img_x = (chunk_x - start_x) * 32 * pixels_per_block + x * pixels_per_block + sub_x
-                            pixel_img_z = (chunk_z - start_z) * 32 * pixels_per_block + z * pixels_per_block + sub_z
-
-                            # Set pixel
-                            pixels[pixel_img_x, pixel_img_z] = (r, g, b)
-
-    # Save image
-    img.save(output_path)
+    chunk_size = 32 * pixels_per_block
+    img_width = chunks_width * chunk_size
+    img_height = chunks_height * chunk_size
+    strips = render_rows(start_x, start_z, end_x, end_z, pixels_per_block, enable_shading, max_workers)
+
+    # Fast zlib level: large maps encode about twice as fast for ~5% larger files
+    if png is not None:
+        # Stream each row strip to the encoder as soon as it is rendered, so the
+        # full raster is never held in memory
+        rows = (row.tobytes() for _, strip in strips for row in strip)
+        writer = png.Writer(img_width, img_height, greyscale=False, compression=1)
+        with open(output_path, "wb") as f:
+            writer.write(f, rows)
+    else:
+        # Create output pixel buffer, indexed [z, x], and copy each finished row
+        # of chunks into it in one block
+        pixels = np.zeros((img_height, img_width, 3), dtype=np.uint8)
+        for chunk_z, strip in strips:
+            pixel_z = (chunk_z - start_z) * chunk_size
+            pixels[pixel_z:pixel_z + chunk_size] = strip
+
+        Image.fromarray(pixels).save(output_path, compress_level=1)
+
     print(f"Saved to {output_path}")
-    print(f"Image size: {img.width}x{img.height}")
+    print(f"Image size: {img_width}x{img_height}")
 
 
 if __name__ == "__main__":
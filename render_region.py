@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Renders every chunk of a region file into a single map image, one chunk per worker task
+"""
+import sys
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from PIL import Image
+import render_chunk
+from render_chunk import get_region, render_chunk_to_array
+
+
+def _init_worker(base_path, region_x, region_z):
+    """Point a worker process at the world and map the region file once"""
+    render_chunk.BASE_PATH = base_path
+    get_region(region_x, region_z, quiet=True)
+
+
+def _render_tile(task):
+    """Render one chunk in a worker process"""
+    chunk_x, chunk_z, pixels_per_block, enable_shading = task
+    return chunk_x, chunk_z, render_chunk_to_array(chunk_x, chunk_z, pixels_per_block, enable_shading, quiet=True)
+
+
+def render_region(region_x, region_z, output_path="region.png", pixels_per_block=1, enable_shading=True, max_workers=None):
+    """
+    Render all chunks of a region into a single map image using a process pool
+
+    Args:
+        region_x: Region X coordinate (chunk_x // 32)
+        region_z: Region Z coordinate (chunk_z // 32)
+        output_path: Output PNG file path
+        pixels_per_block: Resolution multiplier (1=32px/chunk, 2=64px/chunk, etc.)
+        enable_shading: Whether to apply terrain shading (default True)
+        max_workers: Number of worker processes (default: one per CPU)
+    """
+    region = get_region(region_x, region_z)
+    if region is None:
+        return
+
+    # Only queue chunks that are present in the region index
+    tasks = [
+        (region_x * 32 + x, region_z * 32 + z, pixels_per_block, enable_shading)
+        for z in range(32)
+        for x in range(32)
+        if region.chunk_segment(x, z) != 0
+    ]
+    print(f"Rendering region ({region_x}, {region_z}): {len(tasks)} chunks")
+
+    chunk_size = 32 * pixels_per_block
+    pixels = np.zeros((32 * chunk_size, 32 * chunk_size, 3), dtype=np.uint8)
+
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                             initargs=(render_chunk.BASE_PATH, region_x, region_z)) as executor:
+        for chunk_x, chunk_z, tile in executor.map(_render_tile, tasks, chunksize=16):
+            if tile is None:
+                continue
+
+            # Place the chunk tile in the region image
+            pixel_z = (chunk_z - region_z * 32) * chunk_size
+            pixel_x = (chunk_x - region_x * 32) * chunk_size
+            pixels[pixel_z:pixel_z + chunk_size, pixel_x:pixel_x + chunk_size] = tile
+
+    img = Image.fromarray(pixels)
+    img.save(output_path)
+    print(f"Saved to {output_path}")
+    print(f"Image size: {img.width}x{img.height}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 3:
+        print("Usage: python render_region.py <region_x> <region_z> [output.png] [pixels_per_block] [--no-shading]")
+        print()
+        print("Example: python render_region.py 0 0")
+        print("  Renders chunks (0, 0) to (31, 31) at 1x resolution (1024x1024 pixels)")
+        sys.exit(1)
+
+    region_x = int(sys.argv[1])
+    region_z = int(sys.argv[2])
+    args = [arg for arg in sys.argv[3:] if arg != '--no-shading']
+    output = args[0] if args and not args[0].isdigit() else f"region_{region_x}_{region_z}.png"
+    pixels_per_block = int(args[-1]) if args and args[-1].isdigit() else 1
+    enable_shading = '--no-shading' not in sys.argv
+
+    render_region(region_x, region_z, output, pixels_per_block, enable_shading)